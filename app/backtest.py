@@ -0,0 +1,236 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.db import DB_PATH, fetch_events_between
+from app.rules.engine import Rule, _parse_ts, load_rules, run_rules
+
+# Replays stored events through a rule set without touching the alerts table.
+# Usage:
+#   python -m app.backtest --start 2025-01-01 --end 2026-01-01 --out backtest.json
+
+
+def _to_iso(dt: datetime) -> str:
+    return dt.replace(microsecond=0).isoformat() + "Z"
+
+
+def overlap_minutes(rules: List[Rule]) -> int:
+    windows = [
+        int(r.match.get("window_minutes", 10))
+        for r in rules
+        if r.match.get("type", "event") == "threshold"
+    ]
+    return max(windows, default=0)
+
+
+def make_shards(
+    start: datetime,
+    end: datetime,
+    shard_days: int,
+) -> List[Tuple[datetime, datetime]]:
+    shards: List[Tuple[datetime, datetime]] = []
+    step = timedelta(days=shard_days)
+    cur = start
+    while cur < end:
+        nxt = min(cur + step, end)
+        shards.append((cur, nxt))
+        cur = nxt
+    return shards
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    # Stored event timestamps are naive UTC with a trailing Z.
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _to_match(alert: Dict[str, Any]) -> Dict[str, Any]:
+    evidence = alert["evidence"]
+    if "last_ts" in evidence:
+        return {
+            "rule_id": alert["rule_id"],
+            "ts": evidence["last_ts"],
+            "group": evidence["group_value"],
+            "window_minutes": evidence["window_minutes"],
+            "summary": alert["summary"],
+        }
+    return {
+        "rule_id": alert["rule_id"],
+        "ts": evidence["event"]["ts"],
+        "group": None,
+        "window_minutes": 0,
+        "summary": alert["summary"],
+    }
+
+
+def suppress_repeats(matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Keeps a threshold match only if the previous kept match for the same rule
+    and group is more than one window earlier. Runs over the merged shard
+    output so the result does not depend on where shard boundaries fall.
+    """
+    last_hit: Dict[Tuple[str, str], datetime] = {}
+    kept: List[Dict[str, Any]] = []
+    for m in sorted(matches, key=lambda x: x["ts"]):
+        if m["group"] is None:
+            kept.append(m)
+            continue
+        key = (m["rule_id"], m["group"])
+        ts = _parse_ts(m["ts"])
+        prev = last_hit.get(key)
+        if prev is not None and ts - prev <= timedelta(minutes=m["window_minutes"]):
+            continue
+        last_hit[key] = ts
+        kept.append(m)
+    return kept
+
+
+def run_shard(
+    shard_start: str,
+    shard_end: str,
+    overlap: int,
+    rules: List[Rule],
+    db_path: str,
+    now_iso: str,
+) -> Dict[str, Any]:
+    """
+    Evaluates one shard. Events from the preceding `overlap` minutes are loaded
+    as window context, but only matches triggered inside the shard are kept.
+    Every threshold window that fires is returned; repeats are suppressed
+    later by suppress_repeats once all shards are merged.
+    """
+    t0 = time.perf_counter()
+    fetch_start = _to_iso(_parse_ts(shard_start) - timedelta(minutes=overlap))
+    sources = {r.match.get("source") for r in rules}
+    source = sources.pop() if len(sources) == 1 else None
+
+    events = fetch_events_between(fetch_start, shard_end, source=source, db_path=Path(db_path))
+    alerts = run_rules(
+        events=events,
+        rules=rules,
+        now_iso=now_iso,
+        emit_from=shard_start,
+        first_hit_only=False,
+    )
+    return {
+        "start": shard_start,
+        "end": shard_end,
+        "events": len(events),
+        "matches": [_to_match(a) for a in alerts],
+        "runtime_seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+def backtest(
+    rules: List[Rule],
+    start: datetime,
+    end: datetime,
+    db_path: Path = DB_PATH,
+    shard_days: int = 7,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    now_iso = _to_iso(datetime.utcnow())
+    start = _naive_utc(start)
+    end = _naive_utc(end)
+    overlap = overlap_minutes(rules)
+    shards = make_shards(start, end, shard_days)
+
+    args = [
+        (_to_iso(s), _to_iso(e), overlap, rules, str(db_path), now_iso)
+        for s, e in shards
+    ]
+    if workers == 1:
+        results = [run_shard(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_shard, *zip(*args))) if args else []
+
+    per_rule: Dict[str, Dict[str, Any]] = {
+        r.id: {"name": r.name, "hits": 0, "timeline": []} for r in rules
+    }
+    matches: List[Dict[str, Any]] = []
+    for res in results:
+        matches.extend(res.pop("matches"))
+    kept = suppress_repeats(matches)
+
+    for res in results:
+        res["hits"] = sum(1 for m in kept if res["start"] <= m["ts"] < res["end"])
+    for m in kept:
+        entry = per_rule[m["rule_id"]]
+        entry["hits"] += 1
+        entry["timeline"].append({"ts": m["ts"], "summary": m["summary"]})
+
+    return {
+        "created_ts": now_iso,
+        "start": _to_iso(start),
+        "end": _to_iso(end),
+        "shard_days": shard_days,
+        "overlap_minutes": overlap,
+        "shards": results,
+        "rules": per_rule,
+        "runtime_seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.backtest",
+        description="Replay stored events through a rule set over a time range.",
+    )
+    parser.add_argument("--start", required=True, help="range start (ISO date/time, inclusive)")
+    parser.add_argument("--end", required=True, help="range end (ISO date/time, exclusive)")
+    parser.add_argument("--rules", default="app/rules/default_rules.yml", help="rules YAML file")
+    parser.add_argument("--rule", action="append", dest="rule_ids", help="only run this rule id (repeatable)")
+    parser.add_argument("--db", default=str(DB_PATH), help="SQLite database to read events from")
+    parser.add_argument("--shard-days", type=int, default=7, help="days of events per shard")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--out", default="backtest_results.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    try:
+        start = _naive_utc(_parse_ts(args.start))
+        end = _naive_utc(_parse_ts(args.end))
+    except ValueError:
+        parser.error("--start/--end must be ISO dates")
+    if end <= start:
+        parser.error("--end must be after --start")
+    if args.shard_days < 1:
+        parser.error("--shard-days must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if not Path(args.db).is_file():
+        parser.error(f"--db {args.db} does not exist")
+    if not Path(args.rules).is_file():
+        parser.error(f"--rules {args.rules} does not exist")
+
+    rules = load_rules(args.rules)
+    if args.rule_ids:
+        missing = set(args.rule_ids) - {r.id for r in rules}
+        if missing:
+            parser.error(f"unknown --rule: {', '.join(sorted(missing))}")
+        rules = [r for r in rules if r.id in args.rule_ids]
+
+    result = backtest(
+        rules,
+        start,
+        end,
+        db_path=Path(args.db),
+        shard_days=args.shard_days,
+        workers=args.workers,
+    )
+    Path(args.out).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print(f"{len(result['shards'])} shards in {result['runtime_seconds']}s -> {args.out}")
+    for rule_id, entry in result["rules"].items():
+        print(f"  {rule_id}  {entry['hits']:>6}  {entry['name']}")
+
+
+if __name__ == "__main__":
+    main()
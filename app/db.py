@@ -12,6 +12,13 @@ def connect() -> sqlite3.Connection:
     return conn
 
 
+def connect_readonly(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    uri = f"file:{Path(db_path or DB_PATH).resolve().as_posix()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
 def init_db() -> None:
     conn = connect()
     cur = conn.cursor()
@@ -31,6 +38,7 @@ def init_db() -> None:
         )
         """
     )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts)")
 
     cur.execute(
         """
@@ -118,6 +126,27 @@ def fetch_events(source: Optional[str] = None, limit: int = 5000) -> List[Dict[s
     return [dict(r) for r in rows]
 
 
+def fetch_events_between(
+    start_ts: str,
+    end_ts: str,
+    source: Optional[str] = None,
+    db_path: Optional[Path] = None,
+) -> List[Dict[str, Any]]:
+    # Half-open range [start_ts, end_ts); read-only so replays can't write.
+    conn = connect_readonly(db_path)
+    cur = conn.cursor()
+    sql = "SELECT * FROM events WHERE ts >= ? AND ts < ?"
+    params: List[Any] = [start_ts, end_ts]
+    if source:
+        sql += " AND source = ?"
+        params.append(source)
+    sql += " ORDER BY ts ASC, id ASC"
+    cur.execute(sql, params)
+    rows = cur.fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
 def insert_alert(
     created_ts: str,
     rule_id: str,
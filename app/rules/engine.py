@@ -78,12 +78,19 @@ def run_rules(
     events: List[Dict[str, Any]],
     rules: List[Rule],
     now_iso: str,
+    emit_from: Optional[str] = None,
+    first_hit_only: bool = True,
 ) -> List[Dict[str, Any]]:
     """
     Returns a list of alerts dicts:
     {
       created_ts, rule_id, rule_name, severity, summary, evidence, mitre_technique, mitre_tactic
     }
+
+    If emit_from is set, events before it are only used as threshold window
+    context: no alert is emitted for a match whose triggering event is earlier.
+    With first_hit_only=False, threshold rules emit every window that reaches
+    the threshold instead of stopping after the first hit per group.
     """
     alerts: List[Dict[str, Any]] = []
     created_ts = now_iso
@@ -104,6 +111,8 @@ def run_rules(
             value = m.get("value")
 
             for e in scoped:
+                if emit_from is not None and e.get("ts", "") < emit_from:
+                    continue
                 if not _where_ok(e, where):
                     continue
                 if field:
@@ -160,6 +169,8 @@ def run_rules(
                         if t_right - t_left <= timedelta(minutes=window_minutes):
                             break
                         left += 1
+                    if emit_from is not None and evs[right]["ts"] < emit_from:
+                        continue
                     window = evs[left : right + 1]
                     if len(window) >= threshold:
                         first_ts = window[0]["ts"]
@@ -192,7 +203,8 @@ def run_rules(
                             }
                         )
                         # Avoid spamming duplicates for same group by breaking after first hit
-                        break
+                        if first_hit_only:
+                            break
         else:
             continue
 
@@ -0,0 +1,145 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.backtest import backtest, main
+from app.rules.engine import load_rules
+
+
+def _fail(ts, ip="9.9.9.9"):
+    return {
+        "ts": ts,
+        "host": "h",
+        "source": "linux_auth",
+        "event_type": "auth_fail",
+        "user": "admin",
+        "src_ip": ip,
+        "action": "failed_password",
+        "raw": "x",
+    }
+
+
+def _burst(start, minutes, ip="9.9.9.9"):
+    t = datetime.fromisoformat(start)
+    return [_fail((t + timedelta(minutes=i)).isoformat() + "Z", ip) for i in range(minutes)]
+
+
+@pytest.fixture
+def bt_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "bt.db")
+    db.init_db()
+    return tmp_path / "bt.db"
+
+
+def test_backtest_threshold_across_shard_boundary(bt_db):
+    # 6 failures straddling midnight, which is the boundary between 1-day shards
+    db.insert_events(_burst("2025-01-01T23:57:00", 6))
+
+    rules = load_rules("app/rules/default_rules.yml")
+    result = backtest(
+        rules,
+        datetime(2025, 1, 1),
+        datetime(2025, 1, 4),
+        db_path=bt_db,
+        shard_days=1,
+        workers=1,
+    )
+
+    assert result["overlap_minutes"] == 10
+    assert len(result["shards"]) == 3
+    assert result["rules"]["R-002"]["hits"] == 1
+    assert result["rules"]["R-002"]["timeline"][0]["ts"] == "2025-01-02T00:01:00Z"
+    assert [s["hits"] for s in result["shards"]] == [0, 1, 0]
+    assert db.get_counts()["alerts"] == 0
+
+
+def test_backtest_is_independent_of_shard_size(bt_db):
+    # a 25 minute burst across midnight repeats after one window,
+    # and a second burst months later must not be dropped
+    db.insert_events(_burst("2025-01-01T23:50:00", 25))
+    db.insert_events(_burst("2025-03-01T08:00:00", 6))
+    db.insert_events(_burst("2025-03-01T08:00:00", 4, ip="8.8.8.8"))
+
+    rules = load_rules("app/rules/default_rules.yml")
+    results = [
+        backtest(
+            rules,
+            datetime(2025, 1, 1),
+            datetime(2026, 1, 1),
+            db_path=bt_db,
+            shard_days=days,
+            workers=1,
+        )["rules"]
+        for days in (1, 7, 365)
+    ]
+
+    assert results[0] == results[1] == results[2]
+    assert [t["ts"] for t in results[0]["R-002"]["timeline"]] == [
+        "2025-01-01T23:54:00Z",
+        "2025-01-02T00:05:00Z",
+        "2025-03-01T08:04:00Z",
+    ]
+
+
+def test_backtest_process_pool_matches_serial(bt_db):
+    db.insert_events(_burst("2025-01-01T23:50:00", 25))
+    db.insert_events(_burst("2025-01-03T08:00:00", 6, ip="8.8.8.8"))
+
+    rules = load_rules("app/rules/default_rules.yml")
+    serial, pooled = [
+        backtest(
+            rules,
+            datetime(2025, 1, 1),
+            datetime(2025, 1, 5),
+            db_path=bt_db,
+            shard_days=1,
+            workers=workers,
+        )
+        for workers in (1, 2)
+    ]
+
+    assert pooled["rules"] == serial["rules"]
+    assert serial["rules"]["R-002"]["hits"] == 3
+
+
+def test_main_writes_json_for_selected_rules(bt_db, tmp_path):
+    db.insert_events(_burst("2025-01-01T12:00:00", 6))
+    out = tmp_path / "out.json"
+
+    main([
+        "--start", "2025-01-01T00:00:00+00:00",
+        "--end", "2025-01-02",
+        "--db", str(bt_db),
+        "--rule", "R-002",
+        "--workers", "1",
+        "--out", str(out),
+    ])
+
+    result = json.loads(out.read_text(encoding="utf-8"))
+    assert result["start"] == "2025-01-01T00:00:00Z"
+    assert list(result["rules"]) == ["R-002"]
+    assert result["rules"]["R-002"]["hits"] == 1
+
+
+@pytest.mark.parametrize("flag", ["--workers", "--shard-days"])
+def test_main_rejects_non_positive_counts(bt_db, flag):
+    with pytest.raises(SystemExit):
+        main(["--start", "2025-01-01", "--end", "2025-01-02", "--db", str(bt_db), flag, "0"])
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [
+        ["--start", "bogus", "--end", "2025-01-02"],
+        ["--start", "2025-01-01", "--end", "2025-01-02", "--db", "missing.db"],
+        ["--start", "2025-01-01", "--end", "2025-01-02", "--rules", "missing.yml"],
+        ["--start", "2025-01-01", "--end", "2025-01-02", "--rule", "R-02", "--rule", "R-003"],
+    ],
+)
+def test_main_rejects_bad_input(bt_db, tmp_path, extra):
+    argv = ["--db", str(bt_db), "--out", str(tmp_path / "out.json")] + extra
+    with pytest.raises(SystemExit):
+        main(argv)
+    assert not (tmp_path / "out.json").exists()
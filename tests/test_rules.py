@@ -1,4 +1,4 @@
-from app.rules.engine import load_rules, run_rules
+from app.rules.engine import Rule, load_rules, run_rules
 from datetime import datetime
 
 
@@ -25,3 +25,49 @@ def test_threshold_rule_triggers(tmp_path):
     rules = load_rules("rules/default_rules.yml")
     alerts = run_rules(events, rules, now_iso="2025-12-23T12:05:00Z")
     assert any(a["rule_id"] == "R-002" for a in alerts)
+
+
+def test_run_rules_emit_from_skips_context_events():
+    def ev(i, ts, event_type):
+        return {
+            "id": i,
+            "ts": ts,
+            "host": "h",
+            "source": "linux_auth",
+            "event_type": event_type,
+            "user": "root",
+            "src_ip": "9.9.9.9",
+            "action": "x",
+            "raw": "x",
+        }
+
+    events = [ev(1, "2025-12-23T11:59:00Z", "auth_success")]
+    events += [ev(i + 2, f"2025-12-23T11:5{6 + i}:30Z", "auth_fail") for i in range(4)]
+    events += [ev(6, "2025-12-23T12:01:00Z", "auth_fail")]
+    rules = [
+        Rule("E", "root", "", "high", None, None,
+             {"source": "linux_auth", "type": "event", "where": {"event_type": "auth_success"},
+              "field": "user", "op": "equals", "value": "root"}),
+        Rule("T", "brute", "", "high", None, None,
+             {"source": "linux_auth", "type": "threshold", "field": "src_ip",
+              "where": {"event_type": "auth_fail"}, "threshold": 3, "window_minutes": 10}),
+    ]
+
+    # without a cutoff both rules fire, threshold on the 3rd failure
+    alerts = run_rules(events, rules, now_iso="x")
+    assert [a["rule_id"] for a in alerts] == ["E", "T"]
+    assert alerts[1]["evidence"]["last_ts"] == "2025-12-23T11:58:30Z"
+
+    # context events before the cutoff still count toward the window
+    alerts = run_rules(events, rules, now_iso="x", emit_from="2025-12-23T12:00:00Z")
+    assert [a["rule_id"] for a in alerts] == ["T"]
+    assert alerts[0]["evidence"]["last_ts"] == "2025-12-23T12:01:00Z"
+    assert alerts[0]["evidence"]["count"] == 5
+
+    # every window at or above the threshold when first_hit_only is off
+    alerts = run_rules(events, rules[1:], now_iso="x", first_hit_only=False)
+    assert [a["evidence"]["last_ts"] for a in alerts] == [
+        "2025-12-23T11:58:30Z",
+        "2025-12-23T11:59:30Z",
+        "2025-12-23T12:01:00Z",
+    ]